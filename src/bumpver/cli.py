@@ -8,6 +8,7 @@
 import io
 import re
 import sys
+import heapq
 import typing as typ
 import logging
 import datetime as dt
@@ -16,15 +17,11 @@ import subprocess as sp
 import click
 import colorama
 
-from . import vcs
 from . import config
-from . import rewrite
 from . import version
 from . import patterns
 from . import regexfmt
-from . import v1rewrite
 from . import v1version
-from . import v2rewrite
 from . import v2version
 from . import v1patterns
 from . import v2patterns
@@ -47,6 +44,7 @@ _VERBOSE = 0
 
 # pylint:disable=too-many-arguments; such is the cli
 # pylint:disable=too-many-locals; such is the cli
+# pylint:disable=import-outside-toplevel; lazy import of vcs/*rewrite to speed up --help
 
 
 def _configure_logging(verbose: int = 0) -> None:
@@ -68,8 +66,11 @@ def _configure_logging(verbose: int = 0) -> None:
     logger.debug("Logging configured.")
 
 
+# ordered for display in help/error messages
 VALID_RELEASE_TAG_VALUES = ("alpha", "beta", "dev", "rc", "post", "final")
 
+_VALID_RELEASE_TAG_SET: typ.FrozenSet[str] = frozenset(VALID_RELEASE_TAG_VALUES)
+
 
 _current_date = dt.date.today().isoformat()
 
@@ -96,7 +97,7 @@ def _validate_release_tag(tag: typ.Optional[str]) -> None:
     if tag is None:
         return
 
-    if tag in VALID_RELEASE_TAG_VALUES:
+    if tag in _VALID_RELEASE_TAG_SET:
         return
 
     logger.error(f"Invalid argument --tag={tag}")
@@ -335,12 +336,19 @@ def test(
 
 def _grep_text(pattern: patterns.Pattern, text: str, color: bool) -> typ.Iterable[str]:
     all_lines = text.splitlines()
+
+    # NOTE: Line numbers are counted incrementally from the previous
+    #   match, rather than from the start of the text for every match,
+    #   so large files are scanned only once.
+    line_idx    = 0
+    last_offset = 0
     for match in pattern.regexp.finditer(text):
         match_start, match_end = match.span()
 
-        line_idx   = text[:match_start].count("\n")
-        line_start = text.rfind("\n", 0, match_start) + 1
-        line_end   = text.find("\n", match_end, -1)
+        line_idx   += text.count("\n", last_offset, match_start)
+        last_offset = match_start
+        line_start  = text.rfind("\n", 0, match_start) + 1
+        line_end    = text.find("\n", match_end, -1)
         if color:
             matched_line = (
                 text[line_start:match_start]
@@ -488,12 +496,16 @@ def _colored_diff_lines(diff: str) -> typ.Iterable[str]:
 
 
 def _v2_get_diff(cfg: config.Config, new_version: str) -> str:
+    from . import v2rewrite
+
     old_vinfo = v2version.parse_version_info(cfg.current_version, cfg.version_pattern)
     new_vinfo = v2version.parse_version_info(new_version, cfg.version_pattern)
     return v2rewrite.diff(old_vinfo, new_vinfo, cfg.file_patterns)
 
 
 def _v1_get_diff(cfg: config.Config, new_version: str) -> str:
+    from . import v1rewrite
+
     old_vinfo = v1version.parse_version_info(cfg.current_version, cfg.version_pattern)
     new_vinfo = v1version.parse_version_info(new_version, cfg.version_pattern)
     return v1rewrite.diff(old_vinfo, new_vinfo, cfg.file_patterns)
@@ -515,6 +527,8 @@ def _print_diff_str(diff: str) -> None:
 
 
 def _print_diff(cfg: config.Config, new_version: str) -> None:
+    from . import rewrite
+
     try:
         diff = get_diff(cfg, new_version)
         _print_diff_str(diff)
@@ -529,8 +543,16 @@ def _print_diff(cfg: config.Config, new_version: str) -> None:
 def _parse_version_tags(
     all_tags: typ.List[str], version_pattern: str, is_new_pattern: bool
 ) -> typ.List[str]:
+    if is_new_pattern:
+        pattern = v2patterns.compile_pattern(version_pattern)
+    else:
+        pattern = v1patterns.compile_pattern(version_pattern)
+
+    # Cheap rejection of unrelated tags, before the full parse of is_valid.
+    candidate_tags = filter(pattern.regexp.match, all_tags)
+
     version_parser = v2version if is_new_pattern else v1version
-    return [tag for tag in all_tags if version_parser.is_valid(tag, version_pattern)]
+    return [tag for tag in candidate_tags if version_parser.is_valid(tag, version_pattern)]
 
 
 def _is_valid_version(
@@ -554,6 +576,8 @@ def _is_valid_version(
         return False
 
     if unique:
+        from . import vcs
+
         all_tags     = vcs.get_tags(fetch=False, scope=config.TagScope.GLOBAL)
         version_tags = _parse_version_tags(all_tags, raw_pattern, is_new_pattern)
 
@@ -623,6 +647,11 @@ def _update(
     tag_message   : str,
     allow_dirty   : bool = False,
 ) -> None:
+    from . import vcs
+    from . import rewrite
+    from . import v1rewrite
+    from . import v2rewrite
+
     vcs_api: typ.Optional[vcs.VCSAPI] = None
 
     if cfg.commit:
@@ -692,19 +721,40 @@ def init(verbose: int = 0, dry: bool = False) -> None:
 
 
 def get_latest_vcs_version_tag(cfg: config.Config, fetch: bool) -> typ.Optional[str]:
+    from . import vcs
+
     all_tags     = vcs.get_tags(fetch=fetch, scope=cfg.tag_scope)
     version_tags = _parse_version_tags(all_tags, cfg.version_pattern, cfg.is_new_pattern)
 
-    if version_tags:
-        version_tags.sort(key=version.parse_version, reverse=True)
-        _debug_tags = ", ".join(version_tags[:3])
-        logger.debug(f"found tags: {_debug_tags} ... ({len(version_tags)} in total)")
-        return version_tags[0]
-    else:
+    if not version_tags:
         return None
 
+    # Only the latest tag is needed, so avoid sorting all tags.
+    if logger.isEnabledFor(logging.DEBUG):
+        _debug_tags = ", ".join(heapq.nlargest(3, version_tags, key=version.parse_version))
+        logger.debug(f"found tags: {_debug_tags} ... ({len(version_tags)} in total)")
+
+    return max(version_tags, key=version.parse_version)
+
+
+def _is_head_tagged_with_current_version(cfg: config.Config, fetch: bool) -> bool:
+    # NOTE: With tag_scope=branch, the latest tag is the one closest to
+    #   HEAD. If HEAD itself is tagged with the current version, then there
+    #   is no need to list all tags. This is not the case for the other
+    #   scopes, where a newer tag may exist on any other branch.
+    if fetch or cfg.tag_scope != config.TagScope.BRANCH:
+        return False
+
+    from . import vcs
+
+    return vcs.get_head_tag() == cfg.current_version
+
 
 def _update_cfg_from_vcs(cfg: config.Config, fetch: bool) -> config.Config:
+    if _is_head_tagged_with_current_version(cfg, fetch):
+        logger.debug(f"HEAD is tagged with the current version: {cfg.current_version}")
+        return cfg
+
     latest_version_tag = get_latest_vcs_version_tag(cfg, fetch)
 
     if latest_version_tag is None:
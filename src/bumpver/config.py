@@ -744,9 +744,11 @@ def write_content(ctx: ProjectContext) -> None:
     fobj: typ.IO[str]
 
     cfg_content = default_config(ctx)
-    if ctx.config_filepath.exists():
-        cfg_content = "\n" + cfg_content
 
     with ctx.config_filepath.open(mode="at", encoding="utf-8") as fobj:
+        # In append mode the position is at the end of any existing
+        # content, so no separate check is needed if the file exists.
+        if fobj.tell() > 0:
+            fobj.write("\n")
         fobj.write(cfg_content)
     print(f"Updated {ctx.config_rel_path}")
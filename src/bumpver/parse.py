@@ -5,6 +5,7 @@
 # SPDX-License-Identifier: MIT
 """Parse PyCalVer strings from files."""
 
+import re
 import typing as typ
 
 from .patterns import Pattern
@@ -51,17 +52,118 @@ class PatternMatch(typ.NamedTuple):
 
 PatternMatches = typ.Iterable[PatternMatch]
 
+NumberedLines = typ.List[typ.Tuple[LineNo, str]]
 
-def _iter_for_pattern(lines: typ.List[str], pattern: Pattern) -> PatternMatches:
-    for lineno, line in enumerate(lines):
-        match = pattern.regexp.search(line)
+
+# Named groups of different patterns may have the same name (e.g. 'year_y'),
+# which is an error if the patterns are combined into a single regexp.
+RE_NAMED_GROUP = re.compile(r"(?<!\\)\(\?P<\w+>")
+
+
+AnyPatternKey = typ.Tuple[Pattern, ...]
+
+_ANY_PATTERN_RE_CACHE: typ.Dict[AnyPatternKey, typ.Optional[typ.Pattern[str]]] = {}
+
+
+def _any_pattern_regexp(patterns: typ.List[Pattern]) -> typ.Optional[typ.Pattern[str]]:
+    # NOTE: The same list of patterns is used for every file it applies to,
+    #   so the combined regexp is only built once. Patterns are keyed
+    #   directly (rather than with utils.memo), since their str() is costly.
+    key = tuple(patterns)
+    if key not in _ANY_PATTERN_RE_CACHE:
+        _ANY_PATTERN_RE_CACHE[key] = _compile_any_pattern_regexp(key)
+    return _ANY_PATTERN_RE_CACHE[key]
+
+
+def _compile_any_pattern_regexp(patterns: AnyPatternKey) -> typ.Optional[typ.Pattern[str]]:
+    """Combine patterns into a single regexp that matches if any pattern matches.
+
+    >>> from . import v2patterns
+    >>> patterns = [
+    ...     v2patterns.compile_pattern("MAJOR.MINOR.PATCH", 'version="MAJOR.MINOR.PATCH"'),
+    ...     v2patterns.compile_pattern("MAJOR.MINOR.PATCH", "Version MAJOR.MINOR"),
+    ... ]
+    >>> any_pattern_re = _compile_any_pattern_regexp(tuple(patterns))
+    >>> [bool(any_pattern_re.search(line)) for line in ['version="1.2.3"', "Version 1.2", "1.2"]]
+    [True, True, False]
+    """
+    if any(pattern.regexp.flags != re.UNICODE for pattern in patterns):
+        return None
+
+    alternatives = [RE_NAMED_GROUP.sub("(?:", pattern.regexp.pattern) for pattern in patterns]
+    try:
+        return re.compile("|".join("(?:" + alt + ")" for alt in alternatives), flags=re.MULTILINE)
+    except re.error:
+        return None
+
+
+def _iter_candidate_lines(
+    lines: typ.Iterable[str], any_pattern_re: typ.Pattern[str]
+) -> typ.Iterable[typ.Tuple[LineNo, str]]:
+    r"""Iterate over lines (with their line number) that any_pattern_re matches.
+
+    >>> any_pattern_re = re.compile(r"v[0-9]+", flags=re.MULTILINE)
+    >>> list(_iter_candidate_lines(["a", "b = v1", "c", "v2 v3"], any_pattern_re))
+    [(1, 'b = v1'), (3, 'v2 v3')]
+    >>> list(_iter_candidate_lines(iter(["a", "b = v1", "c", "v2 v3"]), any_pattern_re))
+    [(1, 'b = v1'), (3, 'v2 v3')]
+    >>> any_pattern_re = re.compile(r"=\s*v[0-9]+", flags=re.MULTILINE)
+    >>> list(_iter_candidate_lines(["a =", "v1", "c"], any_pattern_re))
+    [(0, 'a ='), (1, 'v1')]
+    """
+    # NOTE: Only a list is scanned as a single text, other iterables
+    #   (such as file objects) are consumed line by line. An empty list
+    #   is also searched line by line, so that a pattern which matches
+    #   the empty string doesn't yield the non-existent line 0.
+    line_list: typ.List[str] = lines if isinstance(lines, list) else []
+    if line_list:
+        text = "\n".join(line_list)
+        # A line may itself contain a newline (e.g. with mixed line separators),
+        # in which case line numbers can't be derived by counting newlines.
+        is_single_text = text.count("\n") == len(line_list) - 1
+    else:
+        is_single_text = False
+
+    if not is_single_text:
+        search = any_pattern_re.search
+        for lineno, line in enumerate(lines):
+            if search(line):
+                yield (lineno, line)
+        return
+
+    # Scan the whole text at once, rather than searching line by line. A
+    # match may span multiple lines (e.g. with a "\s" in a pattern), so all
+    # of them are candidates, as any could have a match of its own.
+    last_lineno = -1
+    last_offset = 0
+    lineno      = 0
+    for match in any_pattern_re.finditer(text):
+        match_start, match_end = match.span()
+        lineno                += text.count("\n", last_offset, match_start)
+        end_lineno             = lineno + text.count("\n", match_start, match_end)
+        last_offset            = match_start
+        for candidate_lineno in range(max(lineno, last_lineno + 1), end_lineno + 1):
+            yield (candidate_lineno, line_list[candidate_lineno])
+        last_lineno = max(last_lineno, end_lineno)
+
+
+def _iter_for_pattern(numbered_lines: NumberedLines, pattern: Pattern) -> PatternMatches:
+    # NOTE: pattern.regexp is compiled once per normalized pattern (see
+    #   v1patterns/v2patterns._compile_pattern_re), we only bind the
+    #   search method here to avoid the attribute lookups for every line.
+    search = pattern.regexp.search
+    for lineno, line in numbered_lines:
+        match = search(line)
         if match and len(match.group(0)) > 0:
             yield PatternMatch(lineno, line, pattern, match.span(), match.group(0))
 
 
-def iter_matches(lines: typ.List[str], patterns: typ.List[Pattern]) -> PatternMatches:
+def iter_matches(lines: typ.Iterable[str], patterns: typ.List[Pattern]) -> PatternMatches:
     """Iterate over all matches of any pattern on any line.
 
+    The lines may be any iterable (such as a file object), only lines
+    which match any of the patterns are kept in memory.
+
     >>> from . import v1patterns
     >>> lines = ["__version__ = 'v201712.0002-alpha'"]
     >>> version_pattern = "{pycalver}"
@@ -76,9 +178,18 @@ def iter_matches(lines: typ.List[str], patterns: typ.List[Pattern]) -> PatternMa
     ...     match  = "v201712.0002-alpha",
     ... )
     """
+    # Lines which none of the patterns match are skipped with a single
+    # scan, so that each pattern is only searched on candidate lines.
+    any_pattern_re = _any_pattern_regexp(patterns)
+    numbered_lines: NumberedLines
+    if any_pattern_re is None:
+        numbered_lines = list(enumerate(lines))
+    else:
+        numbered_lines = list(_iter_candidate_lines(lines, any_pattern_re))
+
     matched_spans: LineSpans = []
     for pattern in patterns:
-        for match in _iter_for_pattern(lines, pattern):
+        for match in _iter_for_pattern(numbered_lines, pattern):
             needle_span = LineSpan(match.lineno, *match.span)
             if not _has_overlap(needle_span, matched_spans):
                 yield match
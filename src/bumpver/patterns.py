@@ -27,3 +27,10 @@ RE_PATTERN_ESCAPES = [
     ("("     , "\u005c("),
     (")"     , "\u005c)"),
 ]
+
+
+# Mappings of ordinal -> escaped string, for use with str.translate, so
+# that a pattern is escaped in a single pass rather than one pass per char.
+RE_PATTERN_ESCAPE_TABLE: typ.Dict[int, str] = {
+    ord(char): escaped for char, escaped in RE_PATTERN_ESCAPES
+}
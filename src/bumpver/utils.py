@@ -22,3 +22,45 @@ def memo(func: typ.Callable) -> typ.Callable:
         return cache[key]
 
     return wrapper
+
+
+CacheKey   = typ.TypeVar('CacheKey')
+CacheValue = typ.TypeVar('CacheValue')
+
+
+class BoundedCache(typ.Generic[CacheKey, CacheValue]):
+    """Cache which starts over once it holds maxsize entries.
+
+    >>> cache = BoundedCache(maxsize=2)
+    >>> cache.get_or_set("a", lambda: 1)
+    1
+    >>> cache.get_or_set("a", lambda: 2)
+    1
+    >>> cache.get_or_set("b", lambda: 3)
+    3
+    >>> cache.get_or_set("c", lambda: 4)
+    4
+    >>> len(cache)
+    1
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._items: typ.Dict[CacheKey, CacheValue] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get_or_set(self, key: CacheKey, make_value: typ.Callable[[], CacheValue]) -> CacheValue:
+        if key in self._items:
+            return self._items[key]
+
+        # NOTE: If make_value raises, nothing is cached.
+        value = make_value()
+        if len(self._items) >= self.maxsize:
+            # NOTE: Rather than tracking which entry is least recently
+            #   used, start over. The caches this is used for only grow
+            #   beyond their bound in unusual cases (e.g. many vcs tags).
+            self._items.clear()
+        self._items[key] = value
+        return value
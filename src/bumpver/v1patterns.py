@@ -35,7 +35,7 @@ import typing as typ
 import logging
 
 from . import utils
-from .patterns import RE_PATTERN_ESCAPES
+from .patterns import RE_PATTERN_ESCAPE_TABLE
 from .patterns import Pattern
 
 logger = logging.getLogger("bumpver.v1patterns")
@@ -57,7 +57,8 @@ PYCALVER_PATTERN = r"""
         \-                      # "-" release prefix
         (?P<release_tag>alpha|beta|dev|rc|post)
     )?
-)(?:\s|$)
+)
+(?=\s|$)                         # lookahead, so the terminator isn't consumed
 """
 
 PYCALVER_RE: typ.Pattern[str] = re.compile(PYCALVER_PATTERN, flags=re.VERBOSE)
@@ -198,11 +199,21 @@ def _init_composite_patterns() -> None:
 _init_composite_patterns()
 
 
+# Most patterns are just a single placeholder such as "{pycalver}" or
+# "{semver}". Their expanded regex strings are precomputed here, so
+# they don't have to be escaped and run through _replace_pattern_parts.
+SINGLE_PART_PATTERN_STRS = {
+    "{" + part_name + "}": f"(?P<{part_name}>{part_pattern})"
+    for part_name, part_pattern in PART_PATTERNS.items()
+}
+
+
+@utils.memo
 def _compile_pattern_re(normalized_pattern: str) -> typ.Pattern[str]:
-    escaped_pattern = normalized_pattern
-    for char, escaped in RE_PATTERN_ESCAPES:
-        escaped_pattern = escaped_pattern.replace(char, escaped)
+    if normalized_pattern in SINGLE_PART_PATTERN_STRS:
+        return re.compile(SINGLE_PART_PATTERN_STRS[normalized_pattern])
 
+    escaped_pattern = normalized_pattern.translate(RE_PATTERN_ESCAPE_TABLE)
     pattern_str = _replace_pattern_parts(escaped_pattern)
     return re.compile(pattern_str)
 
@@ -11,6 +11,7 @@ import datetime as dt
 
 import lexid
 
+from . import utils
 from . import version
 from . import v1patterns
 
@@ -71,14 +72,16 @@ def cal_info(date: typ.Optional[dt.date] = None) -> version.V1CalendarInfo:
     if date is None:
         date = version.TODAY
 
+    doy = version.doy_from_date(date)
+
     kwargs = {
         'year'    : date.year,
         'quarter' : version.quarter_from_month(date.month),
         'month'   : date.month,
         'dom'     : date.day,
-        'doy'     : int(date.strftime("%j"), base=10),
-        'iso_week': int(date.strftime("%W"), base=10),
-        'us_week' : int(date.strftime("%U"), base=10),
+        'doy'     : doy,
+        'iso_week': version.week_w_from_date(date, doy),
+        'us_week' : version.week_u_from_date(date, doy),
     }
 
     return version.V1CalendarInfo(**kwargs)
@@ -124,9 +127,9 @@ def _parse_field_values(field_values: FieldValues) -> version.V1VersionInfo:
 
     if year and month and dom:
         date     = dt.date(year, month, dom)
-        doy      = int(date.strftime("%j"), base=10)
-        iso_week = int(date.strftime("%W"), base=10)
-        us_week  = int(date.strftime("%U"), base=10)
+        doy      = version.doy_from_date(date)
+        iso_week = version.week_w_from_date(date, doy)
+        us_week  = version.week_u_from_date(date, doy)
     else:
         iso_week = None
         us_week  = None
@@ -234,6 +237,58 @@ def _parse_version_info(pattern_groups: PatternGroups) -> version.V1VersionInfo:
     return _parse_field_values(field_values)
 
 
+_PYCALVER_TAGS = frozenset(["alpha", "beta", "dev", "rc", "post", "final"])
+
+
+def _parse_pycalver_field_values(version_str: str) -> typ.Optional[FieldValues]:
+    """Parse a '{pycalver}' version string by slicing at fixed offsets.
+
+    Only complete version strings are parsed, for anything else None is
+    returned and the regular expression of the pattern must be used.
+
+    >>> _parse_pycalver_field_values("v201712.0033-beta")
+    {'year': '2017', 'month': '12', 'bid': '0033', 'tag': 'beta'}
+    >>> _parse_pycalver_field_values("v201712.0033")
+    {'year': '2017', 'month': '12', 'bid': '0033'}
+    >>> _parse_pycalver_field_values("v201713.0033") is None
+    True
+    >>> _parse_pycalver_field_values("v201712.0033-betax") is None
+    True
+    """
+    if len(version_str) < 12 or version_str[0] != "v" or version_str[7] != ".":
+        return None
+
+    year  = version_str[1:5]
+    month = version_str[5:7]
+
+    tag_sep_idx = version_str.find("-", 8)
+    if tag_sep_idx < 0:
+        bid = version_str[8:]
+        tag = ""
+    else:
+        bid = version_str[8:tag_sep_idx]
+        tag = version_str[tag_sep_idx + 1 :]
+        if tag not in _PYCALVER_TAGS:
+            return None
+
+    is_valid_month = month[0] == "0" or month in ("10", "11", "12")
+    is_numeric     = (year + month + bid).strip("0123456789") == ""
+    if not (is_valid_month and is_numeric and len(bid) >= 4):
+        return None
+
+    field_values: FieldValues = {'year': year, 'month': month, 'bid': bid}
+    if tag:
+        field_values['tag'] = tag
+    return field_values
+
+
+ParseVersionInfoKey = typ.Tuple[str, str]
+
+_PARSE_VERSION_INFO_CACHE: utils.BoundedCache[ParseVersionInfoKey, version.V1VersionInfo] = (
+    utils.BoundedCache(maxsize=1024)
+)
+
+
 def parse_version_info(version_str: str, raw_pattern: str = "{pycalver}") -> version.V1VersionInfo:
     """Parse normalized V1VersionInfo.
 
@@ -243,6 +298,21 @@ def parse_version_info(version_str: str, raw_pattern: str = "{pycalver}") -> ver
     >>> vnfo = parse_version_info("1.23.456", raw_pattern="{semver}")
     >>> assert vnfo == _parse_version_info({'MAJOR': "1", 'MINOR': "23", 'PATCH': "456"})
     """
+    # NOTE: The same version strings (current version, vcs tags) are
+    #   parsed repeatedly during a single run. V1VersionInfo is
+    #   immutable, so the result can be shared.
+    cache_key = (version_str, raw_pattern)
+    return _PARSE_VERSION_INFO_CACHE.get_or_set(
+        cache_key, lambda: _parse_version_str(version_str, raw_pattern)
+    )
+
+
+def _parse_version_str(version_str: str, raw_pattern: str) -> version.V1VersionInfo:
+    if raw_pattern == "{pycalver}":
+        field_values = _parse_pycalver_field_values(version_str)
+        if field_values is not None:
+            return _parse_field_values(field_values)
+
     pattern = v1patterns.compile_pattern(raw_pattern)
     match   = pattern.regexp.match(version_str)
     if match is None:
@@ -34,7 +34,7 @@ import typing as typ
 import collections
 
 from . import utils
-from .patterns import RE_PATTERN_ESCAPES
+from .patterns import RE_PATTERN_ESCAPE_TABLE
 from .patterns import Pattern
 
 # NOTE (mb 2020-09-17): For patterns with different options '(AAA|BB|C)', the
@@ -341,16 +341,19 @@ def _replace_pattern_parts(pattern: str) -> str:
     return result_pattern
 
 
-def _compile_pattern_re(normalized_pattern: str) -> typ.Pattern[str]:
-    escaped_pattern = normalized_pattern
-    for char, escaped in RE_PATTERN_ESCAPES:
-        # [] braces are used for optional parts, such as [-TAG]/[-beta]
-        # and need to be escaped manually.
-        is_semantic_char = char in "[]\\"
-        if not is_semantic_char:
-            # escape it so it is a literal in the re pattern
-            escaped_pattern = escaped_pattern.replace(char, escaped)
+# [] braces are used for optional parts, such as [-TAG]/[-beta]
+# and need to be escaped manually. Every other char is escaped
+# so it is a literal in the re pattern.
+_RE_PATTERN_ESCAPE_TABLE: typ.Dict[int, str] = {
+    ordinal: escaped
+    for ordinal, escaped in RE_PATTERN_ESCAPE_TABLE.items()
+    if chr(ordinal) not in "[]\\"
+}
+
 
+@utils.memo
+def _compile_pattern_re(normalized_pattern: str) -> typ.Pattern[str]:
+    escaped_pattern = normalized_pattern.translate(_RE_PATTERN_ESCAPE_TABLE)
     pattern_str = _replace_pattern_parts(escaped_pattern)
     return re.compile(pattern_str)
 
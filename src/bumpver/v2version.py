@@ -5,12 +5,14 @@
 # SPDX-License-Identifier: MIT
 """Functions related to version string manipulation."""
 
+import re
 import typing as typ
 import logging
 import datetime as dt
 
 import lexid
 
+from . import utils
 from . import version
 from . import v2patterns
 
@@ -20,21 +22,45 @@ logger = logging.getLogger("bumpver.v2version")
 CalInfo = typ.Union[version.V2CalendarInfo, version.V2VersionInfo]
 
 
-def _is_cal_gt(left: CalInfo, right: CalInfo) -> bool:
-    """Is left > right for non-None fields."""
+# NOTE: Bound once at import, rather than resolving the attribute chains
+#   on each call of the (frequently called) functions below.
+_V2CalendarInfo = version.V2CalendarInfo
+_V2_CAL_FIELDS  = version.V2CalendarInfo._fields
+_V2_VER_FIELDS  = version.V2VersionInfo._fields
+
+# NOTE: The calendar fields are a prefix of the version fields, so a
+#   V2CalendarInfo can be used positionally to build a V2VersionInfo
+#   and the calendar fields of either can be accessed with a slice.
+_CAL_FIELD_COUNT = len(_V2_CAL_FIELDS)
+
+assert _V2_VER_FIELDS[:_CAL_FIELD_COUNT] == _V2_CAL_FIELDS
+
+_VER_FIELD_INDEX = {field: idx for idx, field in enumerate(_V2_VER_FIELDS)}
 
-    lvals = []
-    rvals = []
-    for field in version.V2CalendarInfo._fields:
-        lval = getattr(left , field)
-        rval = getattr(right, field)
-        if not (lval is None or rval is None):
-            lvals.append(lval)
-            rvals.append(rval)
 
+def _is_cal_gt(left: CalInfo, right: CalInfo) -> bool:
+    """Is left > right for non-None fields.
+
+    >>> left  = version.V2CalendarInfo(2021, None, 1, 2, None, None, None, None, None)
+    >>> right = version.V2CalendarInfo(2021, 2020, None, 1, None, None, None, None, None)
+    >>> (_is_cal_gt(left, right), _is_cal_gt(right, left), _is_cal_gt(left, left))
+    (True, False, False)
+    """
+    pairs = [
+        (lval, rval)
+        for lval, rval in zip(left[:_CAL_FIELD_COUNT], right[:_CAL_FIELD_COUNT])
+        if not (lval is None or rval is None)
+    ]
+    lvals = [lval for lval, _ in pairs]
+    rvals = [rval for _, rval in pairs]
     return lvals > rvals
 
 
+_CAL_INFO_CACHE: utils.BoundedCache[dt.date, version.V2CalendarInfo] = (
+    utils.BoundedCache(maxsize=1024)
+)
+
+
 def cal_info(date: typ.Optional[dt.date] = None) -> version.V2CalendarInfo:
     """Generate calendar components for current date.
 
@@ -59,48 +85,50 @@ def cal_info(date: typ.Optional[dt.date] = None) -> version.V2CalendarInfo:
     if date is None:
         date = version.TODAY
 
-    kwargs = {
-        'year_y' : date.year,
-        'year_g' : int(date.strftime("%G"), base=10),
-        'quarter': version.quarter_from_month(date.month),
-        'month'  : date.month,
-        'dom'    : date.day,
-        'doy'    : int(date.strftime("%j"), base=10),
-        'week_w' : int(date.strftime("%W"), base=10),
-        'week_u' : int(date.strftime("%U"), base=10),
-        'week_v' : int(date.strftime("%V"), base=10),
-    }
+    # NOTE: During a run, cal_info is mostly called with the same date
+    #   (version.TODAY), once for each file that is updated.
+    return _CAL_INFO_CACHE.get_or_set(date, lambda: _make_cal_info(date))
 
-    return version.V2CalendarInfo(**kwargs)
+
+def _make_cal_info(date: dt.date) -> version.V2CalendarInfo:
+    year_g, week_v, _ = date.isocalendar()
+    doy = version.doy_from_date(date)
+
+    return _V2CalendarInfo(
+        year_y=date.year,
+        year_g=year_g,
+        quarter=version.quarter_from_month(date.month),
+        month=date.month,
+        dom=date.day,
+        doy=doy,
+        week_w=version.week_w_from_date(date, doy),
+        week_u=version.week_u_from_date(date, doy),
+        week_v=week_v,
+    )
 
 
 def _ver_to_cal_info(vinfo: version.V2VersionInfo) -> version.V2CalendarInfo:
     defaults = cal_info(version.TODAY)
-    return version.V2CalendarInfo(
-        vinfo.year_y or defaults.year_y,
-        vinfo.year_g or defaults.year_g,
-        vinfo.quarter or defaults.quarter,
-        vinfo.month or defaults.month,
-        vinfo.dom or defaults.dom,
-        vinfo.doy or defaults.doy,
-        vinfo.week_w or defaults.week_w,
-        vinfo.week_u or defaults.week_u,
-        vinfo.week_v or defaults.week_v,
+    return _V2CalendarInfo._make(
+        val or default for val, default in zip(vinfo[:_CAL_FIELD_COUNT], defaults)
     )
 
 
-VALID_FIELD_KEYS = set(version.V2VersionInfo._fields) | {'version'}
+VALID_FIELD_KEYS = set(_V2_VER_FIELDS) | {'version'}
+
+_VALID_FIELD_KEY_PREFIXES = tuple(sorted(VALID_FIELD_KEYS))
 
 MaybeInt = typ.Optional[int]
 
 FieldKey      = str
-MatchGroupKey = str
 MatchGroupStr = str
-
-PatternGroups = typ.Dict[FieldKey, MatchGroupStr]
 FieldValues   = typ.Dict[FieldKey, MatchGroupStr]
 
-VersionInfoKW = typ.Dict[str, typ.Union[str, int, None]]
+
+def _parse_int_field(field_values: FieldValues, key: FieldKey) -> MaybeInt:
+    # NOTE: If a part is optional, the value may be None
+    val = field_values.get(key)
+    return None if val is None else int(val)
 
 
 def parse_field_values_to_cinfo(field_values: FieldValues) -> version.V2CalendarInfo:
@@ -123,57 +151,45 @@ def parse_field_values_to_cinfo(field_values: FieldValues) -> version.V2Calendar
     (2021, 0, 2021, 1, 2020, 53)
     """
     fvals = field_values
-    date: typ.Optional[dt.date] = None
 
-    year_y: MaybeInt = int(fvals['year_y']) if 'year_y' in fvals else None
-    year_g: MaybeInt = int(fvals['year_g']) if 'year_g' in fvals else None
+    year_y : MaybeInt = _parse_int_field(fvals, 'year_y')
+    year_g : MaybeInt = _parse_int_field(fvals, 'year_g')
+    quarter: MaybeInt = _parse_int_field(fvals, 'quarter')
+    month  : MaybeInt = _parse_int_field(fvals, 'month')
+    dom    : MaybeInt = _parse_int_field(fvals, 'dom')
+    doy    : MaybeInt = _parse_int_field(fvals, 'doy')
+    week_w : MaybeInt = _parse_int_field(fvals, 'week_w')
+    week_u : MaybeInt = _parse_int_field(fvals, 'week_u')
+    week_v : MaybeInt = _parse_int_field(fvals, 'week_v')
 
     if year_y is not None and year_y < 1000:
         year_y += 2000
     if year_g is not None and year_g < 1000:
         year_g += 2000
 
-    month: MaybeInt = int(fvals['month']) if 'month' in fvals else None
-    doy  : MaybeInt = int(fvals['doy'  ]) if 'doy' in fvals else None
-    dom  : MaybeInt = int(fvals['dom'  ]) if 'dom' in fvals else None
-
-    week_w: MaybeInt = int(fvals['week_w']) if 'week_w' in fvals else None
-    week_u: MaybeInt = int(fvals['week_u']) if 'week_u' in fvals else None
-    week_v: MaybeInt = int(fvals['week_v']) if 'week_v' in fvals else None
-
+    date: typ.Optional[dt.date] = None
     if year_y and doy:
-        date  = version.date_from_doy(year_y, doy)
-        month = date.month
-        dom   = date.day
-    else:
-        month = int(fvals['month']) if 'month' in fvals else None
-        dom   = int(fvals['dom'  ]) if 'dom' in fvals else None
-
-    if year_y and month and dom:
+        date = version.date_from_doy(year_y, doy)
+    elif year_y and month and dom:
         date = dt.date(year_y, month, dom)
-
-    # Use of defaults is an all or nothing affair.
-    # We don't to mix anything from TODAY with stuff
-    # that was actually parsed from a string.
-    if not any((date, year_y, year_g, month, dom, doy, week_w, week_u, week_v)):
+    elif not any((year_y, year_g, month, dom, doy, week_w, week_u, week_v)):
+        # Use of defaults is an all or nothing affair.
+        # We don't to mix anything from TODAY with stuff
+        # that was actually parsed from a string.
         date = version.TODAY
 
-    # derive all fields from other previous values
     if date:
-        year_y = int(date.strftime("%Y"), base=10)
-        year_g = int(date.strftime("%G"), base=10)
-        month  = int(date.strftime("%m"), base=10)
-        dom    = int(date.strftime("%d"), base=10)
-        doy    = int(date.strftime("%j"), base=10)
-        week_w = int(date.strftime("%W"), base=10)
-        week_u = int(date.strftime("%U"), base=10)
-        week_v = int(date.strftime("%V"), base=10)
-
-    quarter = int(fvals['quarter']) if 'quarter' in fvals else None
+        # derive all fields from the date
+        cinfo = cal_info(date)
+        if quarter is None:
+            return cinfo
+        else:
+            return cinfo._replace(quarter=quarter)
+
     if quarter is None and month:
         quarter = version.quarter_from_month(month)
 
-    return version.V2CalendarInfo(
+    return _V2CalendarInfo(
         year_y=year_y,
         year_g=year_g,
         quarter=quarter,
@@ -214,8 +230,9 @@ def parse_field_values_to_vinfo(field_values: FieldValues) -> version.V2VersionI
     (1, 23, 45, 'final')
     """
     # pylint:disable=dangerous-default-value; We don't mutate args, mypy would fail if we did.
-    for key in field_values:
-        assert any(key.startswith(fkey) for fkey in VALID_FIELD_KEYS), key
+    if __debug__:
+        for key in field_values:
+            assert key.startswith(_VALID_FIELD_KEY_PREFIXES), key
 
     cinfo = parse_field_values_to_cinfo(field_values)
 
@@ -228,12 +245,10 @@ def parse_field_values_to_vinfo(field_values: FieldValues) -> version.V2VersionI
 
     if tag and not pytag:
         pytag = version.PEP440_TAG_BY_TAG[tag]
-    elif pytag and not tag:
+    elif not tag:
+        # NOTE: this also defaults to "final" if there is no pytag either
         tag = version.TAG_BY_PEP440_TAG[pytag]
 
-    if not tag:
-        tag = "final"
-
     # NOTE (mb 2020-09-18): If a part is optional, fvals[<field>] may be None
     major = int(fvals.get('major') or 0)
     minor = int(fvals.get('minor') or 0)
@@ -244,15 +259,7 @@ def parse_field_values_to_vinfo(field_values: FieldValues) -> version.V2VersionI
     inc1  = int(fvals.get('inc1') or 1)
 
     return version.V2VersionInfo(
-        year_y=cinfo.year_y,
-        year_g=cinfo.year_g,
-        quarter=cinfo.quarter,
-        month=cinfo.month,
-        dom=cinfo.dom,
-        doy=cinfo.doy,
-        week_w=cinfo.week_w,
-        week_u=cinfo.week_u,
-        week_v=cinfo.week_v,
+        *cinfo,
         major=major,
         minor=minor,
         patch=patch,
@@ -267,6 +274,13 @@ def parse_field_values_to_vinfo(field_values: FieldValues) -> version.V2VersionI
     )
 
 
+ParseVersionInfoKey = typ.Tuple[str, str, dt.date]
+
+_PARSE_VERSION_INFO_CACHE: utils.BoundedCache[ParseVersionInfoKey, version.V2VersionInfo] = (
+    utils.BoundedCache(maxsize=1024)
+)
+
+
 def parse_version_info(
     version_str: str, raw_pattern: str = "vYYYY0M.BUILD[-TAG]"
 ) -> version.V2VersionInfo:
@@ -288,6 +302,17 @@ def parse_version_info(
     >>> fvals = {'major': "1", 'minor': "23", 'patch': "456"}
     >>> assert vinfo == parse_field_values_to_vinfo(fvals)
     """
+    # NOTE: The same version strings (current version, vcs tags) are
+    #   parsed repeatedly during a single run. V2VersionInfo is immutable,
+    #   so the result can be shared. TODAY is part of the cache key, since
+    #   calendar fields default to it for patterns without any.
+    cache_key = (version_str, raw_pattern, version.TODAY)
+    return _PARSE_VERSION_INFO_CACHE.get_or_set(
+        cache_key, lambda: _parse_version_str(version_str, raw_pattern)
+    )
+
+
+def _parse_version_str(version_str: str, raw_pattern: str) -> version.V2VersionInfo:
     pattern = v2patterns.compile_pattern(raw_pattern)
     match   = pattern.regexp.match(version_str)
     if match is None:
@@ -296,7 +321,7 @@ def parse_version_info(
             f"for pattern '{raw_pattern}'/'{pattern.regexp.pattern}'"
         )
         raise version.PatternError(err_msg)
-    elif len(match.group()) < len(version_str):
+    elif match.end() < len(version_str):
         err_msg = (
             f"Incomplete match '{match.group()}' for version string '{version_str}' "
             f"with pattern '{raw_pattern}'/'{pattern.regexp.pattern}'"
@@ -318,7 +343,17 @@ def is_valid(version_str: str, raw_pattern: str = "vYYYY.BUILD[-TAG]") -> bool:
     True
     >>> is_valid("v201712.0033-beta", raw_pattern="MAJOR.MINOR.PATCH")
     False
+    >>> is_valid("1.2.3-beta", raw_pattern="MAJOR.MINOR.PATCH")
+    False
     """
+    # NOTE: Most strings checked here (e.g. vcs tags) don't match, so they
+    #   are rejected without going through the PatternError of
+    #   parse_version_info, which is comparatively expensive.
+    pattern = v2patterns.compile_pattern(raw_pattern)
+    match   = pattern.regexp.match(version_str)
+    if match is None or match.end() < len(version_str):
+        return False
+
     try:
         parse_version_info(version_str, raw_pattern)
         return True
@@ -326,11 +361,13 @@ def is_valid(version_str: str, raw_pattern: str = "vYYYY.BUILD[-TAG]") -> bool:
         return False
 
 
-TemplateKwargs = typ.Dict[str, typ.Union[str, int, None]]
-PartValues     = typ.List[typ.Tuple[str, str]]
+PartValues = typ.Dict[str, str]
 
 
-def _format_part_values(vinfo: version.V2VersionInfo) -> PartValues:
+def _format_part_values(
+    vinfo: version.V2VersionInfo,
+    parts: typ.Optional[typ.Iterable[str]] = None,
+) -> PartValues:
     """Generate kwargs for template from minimal V2VersionInfo.
 
     The V2VersionInfo Tuple only has the minimal representation
@@ -338,6 +375,8 @@ def _format_part_values(vinfo: version.V2VersionInfo) -> PartValues:
     It may for example have month=9, but not the formatted
     representation '09' for '0M'.
 
+    If parts is given, only the values for these are generated.
+
     >>> vinfo = parse_version_info("v200709.1033-beta", raw_pattern="vYYYY0M.BUILD[-TAG]")
     >>> kwargs = dict(_format_part_values(vinfo))
     >>> (kwargs['YYYY'], kwargs['0M'], kwargs['BUILD'], kwargs['TAG'])
@@ -349,71 +388,77 @@ def _format_part_values(vinfo: version.V2VersionInfo) -> PartValues:
     >>> kwargs = dict(_format_part_values(vinfo))
     >>> (kwargs['YYYY'], kwargs['0M'], kwargs['BUILD'], kwargs['PYTAG'], kwargs['NUM'])
     ('2007', '09', '1033', 'b', '1')
+    >>> _format_part_values(vinfo, parts=['YYYY', 'NUM'])
+    {'YYYY': '2007', 'NUM': '1'}
     """
-    vnfo_kwargs: TemplateKwargs = vinfo._asdict()
-    kwargs     : typ.Dict[str, str] = {}
+    kwargs: PartValues = {}
 
-    for part, field in v2patterns.PATTERN_PART_FIELDS.items():
-        field_val = vnfo_kwargs[field]
+    if parts is None:
+        parts = v2patterns.PATTERN_PART_FIELDS.keys()
+
+    for part in parts:
+        field     = v2patterns.PATTERN_PART_FIELDS[part]
+        field_val = getattr(vinfo, field)
         if field_val is not None:
             format_fn = v2patterns.PART_FORMATS[part]
             kwargs[part] = format_fn(field_val)
 
-    return sorted(kwargs.items(), key=lambda item: -len(item[0]))
+    return kwargs
 
 
 Segment = str
 # mypy limitation wrt. cyclic definition
-# SegmentTree = typ.List[typ.Union[Segment, "SegmentTree"]]
+# SegmentTree = typ.Tuple[typ.Union[Segment, "SegmentTree"], ...]
 SegmentTree = typ.Any
 
 
+def _freeze_segtree(segtree: SegmentTree) -> SegmentTree:
+    return tuple(_freeze_segtree(seg) if isinstance(seg, list) else seg for seg in segtree)
+
+
+# A token is either an unescaped brace or a segment, i.e. a run of
+# anything else. A brace preceded by a backslash is part of a segment.
+_SEGTREE_TOKEN_RE = re.compile(r"(?:[^\[\]\\]|\\[\[\]]?)+|[\[\]]")
+
+
+@utils.memo
 def _parse_segtree(raw_pattern: str) -> SegmentTree:
     """Generate segment tree from pattern string.
 
+    The tree only depends on the pattern, so it is cached and
+    (being shared) returned as immutable nested tuples.
+
     >>> _parse_segtree('aa[bb[cc]]')
-    ['aa', ['bb', ['cc']]]
+    ('aa', ('bb', ('cc',)))
     >>> _parse_segtree('aa[bb[cc]dd[ee]ff]gg')
-    ['aa', ['bb', ['cc'], 'dd', ['ee'], 'ff'], 'gg']
+    ('aa', ('bb', ('cc',), 'dd', ('ee',), 'ff'), 'gg')
     """
 
     internal_root: SegmentTree = []
     branch_stack : typ.List[SegmentTree] = [internal_root]
-    segment_start_index = -1
 
     raw_pattern = "[" + raw_pattern + "]"
 
-    for i, char in enumerate(raw_pattern):
-        is_escaped = i > 0 and raw_pattern[i - 1] == "\\"
-        if char in "[]" and not is_escaped:
-            start = segment_start_index + 1
-            end   = i
-            if start < end:
-                branch_stack[-1].append(raw_pattern[start:end])
-
-            if char == "[":
-                new_branch: SegmentTree = []
-                branch_stack[-1].append(new_branch)
-                branch_stack.append(new_branch)
-                segment_start_index = i
-            elif char == "]":
-                if len(branch_stack) == 1:
-                    err = f"Unbalanced brace(s) in '{raw_pattern}'"
-                    raise ValueError(err)
-
-                branch_stack.pop()
-                segment_start_index = i
-            else:
-                raise NotImplementedError("Unreachable")
+    for match in _SEGTREE_TOKEN_RE.finditer(raw_pattern):
+        token = match.group()
+        if token == "[":
+            new_branch: SegmentTree = []
+            branch_stack[-1].append(new_branch)
+            branch_stack.append(new_branch)
+        elif token == "]":
+            if len(branch_stack) == 1:
+                err = f"Unbalanced brace(s) in '{raw_pattern}'"
+                raise ValueError(err)
+
+            branch_stack.pop()
+        else:
+            branch_stack[-1].append(token)
 
     if len(branch_stack) > 1:
         err = f"Unclosed brace in '{raw_pattern}'"
         raise ValueError(err)
 
-    return internal_root[0]
-
-
-FormattedSegmentParts = typ.List[str]
+    return _freeze_segtree(internal_root[0])
 
 
 class FormatedSeg(typ.NamedTuple):
@@ -422,42 +467,109 @@ class FormatedSeg(typ.NamedTuple):
     result    : str
 
 
-def _format_segment(seg: Segment, part_values: PartValues) -> FormatedSeg:
-    zero_part_count = 0
+# longer parts first, so that e.g. 'YYYY' is replaced before 'YY'
+_PARTS_BY_LENGTH = sorted(v2patterns.PATTERN_PART_FIELDS.keys(), key=len, reverse=True)
 
-    # find all parts, regardless of zero value
-    used_parts: typ.List[typ.Tuple[str, str]] = []
 
-    for part, part_value in part_values:
-        if part in seg:
-            used_parts.append((part, part_value))
-            if version.is_zero_val(part, part_value):
-                zero_part_count += 1
+_REGEX_CHAR_DELETE_TABLE: typ.Dict[int, None] = {ord("^"): None, ord("$"): None}
+
+
+# NOTE: Same as version.is_zero_val, as a single set lookup.
+_ZERO_PART_VALUES = frozenset(version.PART_ZERO_VALUES.items())
+
+
+class ParsedSeg(typ.NamedTuple):
+    parts   : typ.Tuple[str, ...]
+    template: str
+
+
+@utils.memo
+def _parse_segment(seg: Segment) -> ParsedSeg:
+    r"""Find the parts of a segment and prepare it for formatting.
+
+    >>> _parse_segment(r"v\[YYYY.BUILD")
+    ParsedSeg(parts=('BUILD', 'YYYY', 'YY'), template='v[YYYY.BUILD')
+    """
+    parts = tuple(part for part in _PARTS_BY_LENGTH if part in seg)
 
-    result = seg
     # remove regex chars
-    result = result.replace(r"^", r"")
-    result = result.replace(r"$", r"")
+    template = seg.translate(_REGEX_CHAR_DELETE_TABLE)
 
     # unescape braces
-    result = result.replace(r"\[", r"[")
-    result = result.replace(r"\]", r"]")
+    template = template.replace(r"\[", r"[")
+    template = template.replace(r"\]", r"]")
 
-    for part, part_value in used_parts:
-        result = result.replace(part, part_value)
+    return ParsedSeg(parts, template)
+
+
+def _format_segment(parsed_seg: ParsedSeg, part_values: PartValues) -> FormatedSeg:
+    result = parsed_seg.template
+
+    # NOTE: Most segments are literal glue like "v", "." or "-".
+    if not parsed_seg.parts:
+        return FormatedSeg(True, False, result)
+
+    used_part_count = 0
+    zero_part_count = 0
+
+    # NOTE: Parts are replaced in the same pass that finds them. For
+    #   the short segments of a pattern, chained str.replace calls are
+    #   faster than a single re.sub with a lookup callback.
+    for part in parsed_seg.parts:
+        part_value = part_values.get(part)
+        if part_value is not None:
+            result = result.replace(part, part_value)
+            used_part_count += 1
+            if (part, part_value) in _ZERO_PART_VALUES:
+                zero_part_count += 1
 
     # If a segment has no parts at all, it is a literal string
     # (typically a prefix or sufix) and should be output as is.
-    is_literal_seg = len(used_parts) == 0
+    is_literal_seg = used_part_count == 0
     if is_literal_seg:
         return FormatedSeg(True, False, result)
-    elif zero_part_count > 0 and zero_part_count == len(used_parts):
+    elif zero_part_count > 0 and zero_part_count == used_part_count:
         # all zero, omit segment completely
         return FormatedSeg(False, True, result)
     else:
         return FormatedSeg(False, False, result)
 
 
+def _parse_segment_tree(segtree: SegmentTree) -> SegmentTree:
+    return tuple(
+        _parse_segment(seg) if isinstance(seg, str) else _parse_segment_tree(seg)
+        for seg in segtree
+    )
+
+
+class ParsedPattern(typ.NamedTuple):
+    parts   : typ.Tuple[str, ...]
+    segtree : SegmentTree
+    flat_seg: typ.Optional[ParsedSeg]
+
+
+@utils.memo
+def _parse_pattern(raw_pattern: str) -> ParsedPattern:
+    """Prepare a pattern for formatting.
+
+    The segments of the tree are parsed up front, so formatting doesn't
+    have to look them up again. Patterns without optional parts, such
+    as "MAJOR.MINOR.PATCH", consist of a single (flat) segment.
+
+    >>> _parse_pattern("MAJOR.MINOR.PATCH").flat_seg
+    ParsedSeg(parts=('MAJOR', 'MINOR', 'PATCH'), template='MAJOR.MINOR.PATCH')
+    >>> _parse_pattern("vMAJOR[.MINOR]").flat_seg is None
+    True
+    """
+    segtree = _parse_segment_tree(_parse_segtree(raw_pattern))
+    is_flat = len(segtree) == 1 and isinstance(segtree[0], ParsedSeg)
+    return ParsedPattern(
+        parts=_parse_pattern_parts(raw_pattern),
+        segtree=segtree,
+        flat_seg=segtree[0] if is_flat else None,
+    )
+
+
 def _format_segment_tree(
     segtree    : SegmentTree,
     part_values: PartValues,
@@ -468,16 +580,15 @@ def _format_segment_tree(
     result_parts: typ.List[str] = []
     is_zero = True
     for seg in segtree:
-        if isinstance(seg, list):
-            formatted_seg = _format_segment_tree(seg, part_values)
-        else:
+        # NOTE: ParsedSeg is itself a tuple, so it must be checked first.
+        if isinstance(seg, ParsedSeg):
             formatted_seg = _format_segment(seg, part_values)
-
-        if formatted_seg.is_literal:
-            result_parts.append(formatted_seg.result)
         else:
+            formatted_seg = _format_segment_tree(seg, part_values)
+
+        if not formatted_seg.is_literal:
             is_zero = is_zero and formatted_seg.is_zero
-            result_parts.append(formatted_seg.result)
+        result_parts.append(formatted_seg.result)
 
     result = "" if is_zero else "".join(result_parts)
     return FormatedSeg(False, is_zero, result)
@@ -569,46 +680,81 @@ def format_version(vinfo: version.V2VersionInfo, raw_pattern: str) -> str:
     >>> format_version(vinfo_d, raw_pattern='__version__ = "vMAJOR[.MINOR[.PATCH[-TAGNUM]]]"')
     '__version__ = "v1.0.0-rc2"'
     """
-    part_values   = _format_part_values(vinfo)
-    segtree       = _parse_segtree(raw_pattern)
-    formatted_seg = _format_segment_tree(segtree, part_values)
+    parsed_pattern = _parse_pattern(raw_pattern)
+    part_values    = _format_part_values(vinfo, parsed_pattern.parts)
+
+    if parsed_pattern.flat_seg:
+        # Fast path for patterns without optional parts, such as
+        # "MAJOR.MINOR.PATCH". Same result as _format_segment_tree
+        # for a tree with only a single segment.
+        formatted_seg = _format_segment(parsed_pattern.flat_seg, part_values)
+        if formatted_seg.is_literal or formatted_seg.is_zero:
+            return ""
+        else:
+            return formatted_seg.result
+
+    formatted_seg = _format_segment_tree(parsed_pattern.segtree, part_values)
     return formatted_seg.result
 
 
+@utils.memo
+def _parse_pattern_parts(raw_pattern: str) -> typ.Tuple[str, ...]:
+    """Find all parts used in any segment of a pattern.
+
+    >>> _parse_pattern_parts("vYYYY0M.BUILD[-TAG]")
+    ('YYYY', 'YY', '0M', 'BUILD', 'TAG')
+    """
+    used_parts: typ.Set[str] = set()
+    for seg in _iter_flat_segtree(_parse_segtree(raw_pattern)):
+        used_parts.update(_parse_segment(seg).parts)
+
+    return tuple(part for part in v2patterns.PATTERN_PART_FIELDS if part in used_parts)
+
+
 def _iter_flat_segtree(segtree: SegmentTree) -> typ.Iterable[Segment]:
-    """Flatten a SegmentTree (mixed nested list of lists or str).
+    """Flatten a SegmentTree (mixed nested tuple of tuples or str).
 
-    >>> list(_iter_flat_segtree(['aa', ['bb', ['cc'], 'dd', ['ee'], 'ff'], 'gg']))
+    >>> list(_iter_flat_segtree(('aa', ('bb', ('cc',), 'dd', ('ee',), 'ff'), 'gg')))
     ['aa', 'bb', 'cc', 'dd', 'ee', 'ff', 'gg']
     """
-    for subtree in segtree:
-        if isinstance(subtree, list):
-            for seg in _iter_flat_segtree(subtree):
-                yield seg
+    # NOTE: An explicit stack of iterators is used instead of recursion,
+    #   since lib3to6 doesn't support 'yield from' and each recursive call
+    #   would add another generator frame to the chain.
+    stack = [iter(segtree)]
+    while stack:
+        for subtree in stack[-1]:
+            if isinstance(subtree, tuple):
+                stack.append(iter(subtree))
+                break
+            else:
+                yield subtree
         else:
-            yield subtree
+            stack.pop()
 
 
-def _parse_pattern_fields(raw_pattern: str) -> typ.List[str]:
-    parts = list(v2patterns.PATTERN_PART_FIELDS.keys())
-    parts.sort(key=len, reverse=True)
+@utils.memo
+def _parse_pattern_fields(raw_pattern: str) -> typ.Tuple[str, ...]:
+    """Find the fields of the parts in a pattern, in order of occurrence.
 
+    >>> _parse_pattern_fields("vMAJOR.MINOR[.PATCH[-TAGNUM]]")
+    ('major', 'minor', 'patch', 'tag', 'num')
+    """
     segtree  = _parse_segtree(raw_pattern)
     segments = _iter_flat_segtree(segtree)
 
     fields_by_index = {}
     for segment_index, segment in enumerate(segments):
-        for part in parts:
+        # NOTE: The parts of a segment are already in _PARTS_BY_LENGTH order.
+        for part in _parse_segment(segment).parts:
             part_index = segment.find(part, 0)
-            if part_index >= 0:
-                field = v2patterns.PATTERN_PART_FIELDS[part]
-                fields_by_index[segment_index, part_index] = field
+            field      = v2patterns.PATTERN_PART_FIELDS[part]
+            fields_by_index[segment_index, part_index] = field
 
-    return [field for _, field in sorted(fields_by_index.items())]
+    return tuple(field for _, field in sorted(fields_by_index.items()))
 
 
 def _iter_reset_field_items(
-    fields   : typ.List[str],
+    fields   : typ.Sequence[str],
     old_vinfo: version.V2VersionInfo,
     cur_vinfo: version.V2VersionInfo,
 ) -> typ.Iterable[typ.Tuple[str, str]]:
@@ -618,8 +764,10 @@ def _iter_reset_field_items(
         initial_val = version.V2_FIELD_INITIAL_VALUES.get(field)
         if has_reset and initial_val is not None:
             yield field, initial_val
-        elif getattr(old_vinfo, field) != getattr(cur_vinfo, field):
-            has_reset = True
+        else:
+            field_idx = _VER_FIELD_INDEX[field]
+            if old_vinfo[field_idx] != cur_vinfo[field_idx]:
+                has_reset = True
 
 
 def _reset_rollover_fields(
@@ -634,32 +782,26 @@ def _reset_rollover_fields(
     fields       = _parse_pattern_fields(raw_pattern)
     reset_fields = dict(_iter_reset_field_items(fields, old_vinfo, cur_vinfo))
 
-    cur_kwargs = cur_vinfo._asdict()
+    # NOTE: All updates are applied with a single _replace. The reset
+    #   values for major/minor/patch/inc0/inc1 are the (int converted)
+    #   V2_FIELD_INITIAL_VALUES, so they need no special case here.
+    updates: typ.Dict[str, typ.Any] = {}
     for field, value in reset_fields.items():
         if value.isdigit():
-            cur_kwargs[field] = int(value)
+            updates[field] = int(value)
         else:
-            cur_kwargs[field] = value
-
-    cur_vinfo = version.V2VersionInfo(**cur_kwargs)
-
-    if 'major' in reset_fields:
-        cur_vinfo = cur_vinfo._replace(major=0)
-    if 'minor' in reset_fields:
-        cur_vinfo = cur_vinfo._replace(minor=0)
-    if 'patch' in reset_fields:
-        cur_vinfo = cur_vinfo._replace(patch=0)
-    if 'inc0' in reset_fields:
-        cur_vinfo = cur_vinfo._replace(inc0=0)
-    if 'inc1' in reset_fields:
-        cur_vinfo = cur_vinfo._replace(inc1=1)
-    if 'tag' in reset_fields:
-        cur_vinfo = cur_vinfo._replace(tag="final", pytag="")
-    if 'pytag' in reset_fields:
-        cur_vinfo = cur_vinfo._replace(tag="final", pytag="")
+            updates[field] = value
+
+    if 'tag' in reset_fields or 'pytag' in reset_fields:
+        updates['tag'] = "final"
+        updates['pytag'] = ""
     if 'tag_num' in reset_fields:
-        cur_vinfo = cur_vinfo._replace(num=0)
-    return cur_vinfo
+        updates['num'] = 0
+
+    if updates:
+        return cur_vinfo._replace(**updates)
+    else:
+        return cur_vinfo
 
 
 def _incr_numeric(
@@ -693,38 +835,62 @@ def _incr_numeric(
     >>> (new_vinfo.major, new_vinfo.minor, new_vinfo.patch, new_vinfo.tag, new_vinfo.pytag, new_vinfo.num)
     (1, 2, 4, 'beta', 'b', 0)
     """
+    # NOTE: Updates are collected and applied with a single _replace,
+    #   rather than rebuilding the namedtuple for each field.
+    updates: typ.Dict[str, typ.Any] = {}
     if major:
-        cur_vinfo = cur_vinfo._replace(major=cur_vinfo.major + 1)
+        updates['major'] = cur_vinfo.major + 1
     if minor:
-        cur_vinfo = cur_vinfo._replace(minor=cur_vinfo.minor + 1)
+        updates['minor'] = cur_vinfo.minor + 1
     if patch:
-        cur_vinfo = cur_vinfo._replace(patch=cur_vinfo.patch + 1)
+        updates['patch'] = cur_vinfo.patch + 1
     if tag_num:
-        cur_vinfo = cur_vinfo._replace(num=cur_vinfo.num + 1)
+        updates['num'] = cur_vinfo.num + 1
     if tag:
         if tag != cur_vinfo.tag:
-            cur_vinfo = cur_vinfo._replace(num=0)
-        cur_vinfo = cur_vinfo._replace(tag=tag)
-        pytag     = version.PEP440_TAG_BY_TAG[tag]
-        cur_vinfo = cur_vinfo._replace(pytag=pytag)
+            updates['num'] = 0
+        updates['tag'] = tag
+        updates['pytag'] = version.PEP440_TAG_BY_TAG[tag]
 
     if not pin_increments:
-        cur_vinfo = cur_vinfo._replace(inc0=cur_vinfo.inc0 + 1)
-        cur_vinfo = cur_vinfo._replace(inc1=cur_vinfo.inc1 + 1)
+        updates['inc0'] = cur_vinfo.inc0 + 1
+        updates['inc1'] = cur_vinfo.inc1 + 1
 
+    # NOTE: The bid is incremented even if raw_pattern has no BUILD/BLD
+    #   part, since file patterns may still reference it.
+    bid = cur_vinfo.bid
     # prevent truncation of leading zeros
-    if int(cur_vinfo.bid) < 1000:
-        cur_vinfo = cur_vinfo._replace(bid=str(int(cur_vinfo.bid) + 1000))
+    if int(bid) < 1000:
+        bid = str(int(bid) + 1000)
+
+    updates['bid'] = lexid.next_id(bid)
 
-    cur_vinfo = cur_vinfo._replace(bid=lexid.next_id(cur_vinfo.bid))
+    cur_vinfo = cur_vinfo._replace(**updates)
     return _reset_rollover_fields(raw_pattern, old_vinfo, cur_vinfo)
 
 
+# NOTE: "YY" also covers "YYYY" and "GG" also covers "GGGG"
+_WEEK_PATTERN_PARTS_RE = re.compile(
+    r"(?P<yy>YY|0Y)|(?P<ww>WW|0W|UU|0U)|(?P<gg>GG|0G)|(?P<vv>VV|0V)"
+)
+
+
+@utils.memo
 def is_valid_week_pattern(raw_pattern: str) -> bool:
-    has_yy_part = any(part in raw_pattern for part in ["YYYY", "YY", "0Y"])
-    has_ww_part = any(part in raw_pattern for part in ["WW"  , "0W", "UU", "0U"])
-    has_gg_part = any(part in raw_pattern for part in ["GGGG", "GG", "0G"])
-    has_vv_part = any(part in raw_pattern for part in ["VV"  , "0V"])
+    """Check that year and week parts of a pattern are compatible.
+
+    >>> is_valid_week_pattern("YYYY.0W.BUILD")
+    True
+    >>> is_valid_week_pattern("GGGG.0V.BUILD")
+    True
+    >>> is_valid_week_pattern("YYYY.0V.BUILD")
+    False
+    """
+    found_parts = {match.lastgroup for match in _WEEK_PATTERN_PARTS_RE.finditer(raw_pattern)}
+    has_yy_part = 'yy' in found_parts
+    has_ww_part = 'ww' in found_parts
+    has_gg_part = 'gg' in found_parts
+    has_vv_part = 'vv' in found_parts
     if has_yy_part and has_vv_part:
         alt1 = raw_pattern.replace("V", "W")
         alt2 = raw_pattern.replace("Y", "G")
@@ -18,11 +18,13 @@ mercurial, then the git terms are used. For example "fetch"
 import os
 import re
 import sys
+import time
 import shlex
 import typing as typ
 import logging
 import tempfile
 import subprocess as sp
+import collections
 
 from . import hooks
 from . import config
@@ -47,8 +49,10 @@ VCS_SUBCOMMANDS_BY_NAME = {
     'git': {
         'is_usable'     : "git rev-parse --git-dir",
         'fetch'         : "git fetch",
-        'ls_tags'       : "git tag --list",
+        'ls_tags'       : "git for-each-ref --format=%(refname:strip=2) refs/tags",
         'ls_tags_branch': "git tag --list --merged",
+        'ls_remote_tags': "git ls-remote --tags {remote}",
+        'head_tag'      : "git describe --tags --exact-match HEAD",
         'status'        : "git status --porcelain",
         'add_path'      : "git add --update '{path}'",
         'commit'        : "git commit --message '{message}'",
@@ -79,6 +83,13 @@ VCS_SUBCOMMANDS_BY_NAME = {
 Env = typ.Dict[str, str]
 
 
+# Listing tags should be a single invocation of the vcs, regardless of
+# the number of tags. If it is slow anyway, then the subcommand likely
+# does some work per tag (e.g. "git tag" + "git log" for each tag).
+SLOW_LS_TAGS_DURATION = 1.0
+SLOW_LS_TAGS_MIN_COUNT = 200
+
+
 class VCSAPI:
     """Absraction for git and mercurial."""
 
@@ -127,9 +138,9 @@ class VCSAPI:
                 output = self('ls_branches')
 
                 for match in BRANCH_RE.finditer(output):
-                    branch_info = match.groupdict()
-                    if branch_info['is_current']:
-                        return branch_info['remote']
+                    is_current, remote = match.group('is_current', 'remote')
+                    if is_current:
+                        return remote
 
             output = self('show_remotes')
             if output.strip() == "":
@@ -157,8 +168,15 @@ class VCSAPI:
 
     def ls_tags(self) -> typ.List[str]:
         """List vcs tags on all branches."""
+        tzero        = time.time()
         ls_tag_lines = self('ls_tags').splitlines()
+        duration     = time.time() - tzero
         logger.debug(f"ls_tags output {ls_tag_lines}")
+
+        if duration > SLOW_LS_TAGS_DURATION and len(ls_tag_lines) > SLOW_LS_TAGS_MIN_COUNT:
+            cmd_str = self.subcommands['ls_tags']
+            logger.warning(f"Slow listing of tags ({duration:.1f}s) using '{cmd_str}'")
+
         return [line.strip().split(" ", 1)[0] for line in ls_tag_lines]
 
     def ls_tags_branch(self) -> typ.List[str]:
@@ -167,6 +185,38 @@ class VCSAPI:
         logger.debug(f"ls_tags_branch output {ls_tag_lines}")
         return [line.strip().split(" ", 1)[0] for line in ls_tag_lines]
 
+    def ls_remote_tags(self) -> typ.List[str]:
+        """List tag names of the remote, without fetching any objects."""
+        remote = self.get_remote()
+        if not remote:
+            return []
+
+        ls_remote_lines = self('ls_remote_tags', remote=remote).splitlines()
+        logger.debug(f"ls_remote_tags output {ls_remote_lines}")
+
+        tags: typ.Dict[str, None] = collections.OrderedDict()
+        for line in ls_remote_lines:
+            ref = line.strip().split("\t", 1)[-1]
+            if ref.startswith("refs/tags/"):
+                # annotated tags are listed a second time as "<tag>^{}" (peeled)
+                tag = ref[len("refs/tags/") :]
+                if tag.endswith("^{}"):
+                    tag = tag[: -len("^{}")]
+                tags[tag] = None
+        return list(tags)
+
+    def head_tag(self) -> typ.Optional[str]:
+        """Get a tag of the current commit, if it has any."""
+        if 'head_tag' not in self.subcommands:
+            return None
+
+        try:
+            tag = self('head_tag').strip()
+        except sp.CalledProcessError:
+            # no tag for the current commit
+            return None
+        return tag or None
+
     def add(self, path: str) -> None:
         """Add updates to be included in next commit."""
         try:
@@ -302,12 +352,23 @@ def get_tags(fetch: bool, scope: config.TagScope) -> typ.List[str]:
         vcs_api = get_vcs_api()
         logger.debug(f"vcs found: {vcs_api.name}")
 
-        if fetch:
+        branch_scope = scope == config.TagScope.BRANCH
+
+        # Only the tag names are compared, so unless the tags must be
+        # resolved against the local branch, listing the remote tags is
+        # enough and much cheaper than a full fetch.
+        can_ls_remote = not branch_scope and 'ls_remote_tags' in vcs_api.subcommands
+
+        if fetch and can_ls_remote:
+            logger.info("listing tags from remote (to turn off use: -n / --no-fetch)")
+            local_tags  = vcs_api.ls_tags()
+            remote_tags = vcs_api.ls_remote_tags()
+            known_tags  = set(local_tags)
+            return local_tags + [tag for tag in remote_tags if tag not in known_tags]
+        elif fetch:
             logger.info("fetching tags from remote (to turn off use: -n / --no-fetch)")
             vcs_api.fetch()
 
-        branch_scope = scope == config.TagScope.BRANCH
-
         if branch_scope:
             return vcs_api.ls_tags_branch()
         else:
@@ -315,3 +376,11 @@ def get_tags(fetch: bool, scope: config.TagScope) -> typ.List[str]:
     except OSError:
         logger.debug("No vcs found")
         return []
+
+
+def get_head_tag() -> typ.Optional[str]:
+    try:
+        return get_vcs_api().head_tag()
+    except OSError:
+        logger.debug("No vcs found")
+        return None
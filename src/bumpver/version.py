@@ -13,9 +13,9 @@ def parse_version(version: str) -> typ.Any:
     # pylint: disable=import-outside-toplevel; lazy import to speed up --help
 
     try:
-        import pkg_resources
+        import packaging.version
 
-        return pkg_resources.parse_version(version)
+        return packaging.version.Version(version)
     except (ImportError, ValueError):
         import looseversion
 
@@ -169,6 +169,43 @@ def date_from_doy(year: int, doy: int) -> dt.date:
     return dt.date(year, 1, 1) + dt.timedelta(days=doy - 1)
 
 
+def doy_from_date(date: dt.date) -> int:
+    """Calculate day of year (1 indexed), same as strftime("%j").
+
+    >>> [doy_from_date(dt.date(2016, 1, 1)), doy_from_date(dt.date(2016, 12, 31))]
+    [1, 366]
+    """
+    return date.toordinal() - dt.date(date.year, 1, 1).toordinal() + 1
+
+
+def week_w_from_date(date: dt.date, doy: MaybeInt = None) -> int:
+    """Calculate week of year (Monday as first day), same as strftime("%W").
+
+    Days before the first Monday of the year are in week 0. The day
+    of year can be passed in if it is already known.
+
+    >>> [week_w_from_date(dt.date(2019, 1, day)) for day in range(5, 9)]
+    [0, 0, 1, 1]
+    """
+    if doy is None:
+        doy = doy_from_date(date)
+    return (doy + 6 - date.weekday()) // 7
+
+
+def week_u_from_date(date: dt.date, doy: MaybeInt = None) -> int:
+    """Calculate week of year (Sunday as first day), same as strftime("%U").
+
+    Days before the first Sunday of the year are in week 0. The day
+    of year can be passed in if it is already known.
+
+    >>> [week_u_from_date(dt.date(2019, 1, day)) for day in range(5, 9)]
+    [0, 1, 1, 1]
+    """
+    if doy is None:
+        doy = doy_from_date(date)
+    return (doy + 6 - (date.weekday() + 1) % 7) // 7
+
+
 def quarter_from_month(month: int) -> int:
     """Calculate quarter (1 indexed) from month (1 indexed).
 
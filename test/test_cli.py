@@ -19,6 +19,7 @@ import pytest
 from click.testing import CliRunner
 
 from bumpver import cli
+from bumpver import vcs
 from bumpver import config
 from bumpver import pathlib as pl
 from bumpver import v2patterns
@@ -1514,6 +1515,91 @@ def test_get_latest_vcs_version_tag(runner, vcs_name, tag_scope, expected_versio
     assert latest_version == expected_version
 
 
+def _init_tagged_git_project(runner, tag_scope=None):
+    result = runner.invoke(cli.cli, ['init', "-vv"])
+    assert result.exit_code == 0
+
+    _update_config_val("bumpver.toml", push="false")
+    _update_config_val("bumpver.toml", current_version='"0.1.8"')
+    _update_config_val("bumpver.toml", version_pattern='"MAJOR.MINOR.PATCH"')
+    if tag_scope:
+        _update_config_val("bumpver.toml", tag_scope=f'"{tag_scope.value}"')
+
+    _vcs_init("git", files=["bumpver.toml"])
+
+    result = runner.invoke(cli.cli, ['update', "--patch"])
+    assert result.exit_code == 0
+
+
+def _add_bare_origin(origin_path):
+    shell("git", "init", "--bare", str(origin_path))
+    shell("git", "remote", "add", "origin", str(origin_path))
+    shell("git", "push", "--tags", "origin", "HEAD")
+
+    # a tag that only exists on the remote
+    head_rev = shell("git", "rev-parse", "HEAD").decode("utf-8").strip()
+    shell(
+        "git",
+        "--git-dir",
+        str(origin_path),
+        "tag",
+        "--annotate",
+        "0.2.0",
+        "--message",
+        "remote only",
+        head_rev,
+    )
+
+
+def test_ls_remote_tags_finds_remote_only_tag(runner, tmp_path_factory):
+    _init_tagged_git_project(runner)
+    _add_bare_origin(tmp_path_factory.mktemp("remote") / "origin.git")
+
+    _, cfg = config.init()
+    assert cli.get_latest_vcs_version_tag(cfg, fetch=False) == "0.1.9"
+    assert cli.get_latest_vcs_version_tag(cfg, fetch=True) == "0.2.0"
+
+    # tags were only listed, not fetched
+    local_tags = shell("git", "tag", "--list").decode("utf-8").split()
+    assert local_tags == ["0.1.9"]
+
+
+def test_ls_remote_tags_dedups_peeled(runner, tmp_path_factory):
+    _init_tagged_git_project(runner)
+    _add_bare_origin(tmp_path_factory.mktemp("remote") / "origin.git")
+
+    # both tags are annotated, so both are also listed as peeled "<tag>^{}"
+    ls_remote_output = shell("git", "ls-remote", "--tags", "origin").decode("utf-8")
+    assert "refs/tags/0.1.9^{}" in ls_remote_output
+    assert "refs/tags/0.2.0^{}" in ls_remote_output
+
+    assert vcs.VCSAPI(name='git').ls_remote_tags() == ["0.1.9", "0.2.0"]
+    assert vcs.get_tags(fetch=True, scope=config.TagScope.GLOBAL) == ["0.1.9", "0.2.0"]
+
+
+def test_ls_remote_tags_no_remote(runner):
+    _init_tagged_git_project(runner)
+
+    assert vcs.VCSAPI(name='git').ls_remote_tags() == []
+
+    _, cfg = config.init()
+    assert cli.get_latest_vcs_version_tag(cfg, fetch=True) == "0.1.9"
+
+
+
+def test_head_tag_skips_ls_tags(runner, monkeypatch):
+    _init_tagged_git_project(runner, tag_scope=config.TagScope.BRANCH)
+
+    _, cfg = config.init()
+    assert cfg.current_version == "0.1.9"
+
+    # mock a newer tag which should not be seen, since HEAD is tagged with 0.1.9
+    monkeypatch.setattr(cli, "get_latest_vcs_version_tag", lambda cfg, fetch: "0.2.0")
+    assert cli._update_cfg_from_vcs(cfg, fetch=False) == cfg
+
+    new_cfg = cli._update_cfg_from_vcs(cfg, fetch=True)
+    assert new_cfg.current_version == "0.2.0"
+
 @pytest.mark.parametrize("vcs_name", ['git', 'hg'])
 def test_ignore_vcs_tag(runner, monkeypatch, vcs_name):
     result = runner.invoke(cli.cli, ['init', "-vv"])
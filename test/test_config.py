@@ -356,6 +356,37 @@ def test_parse_toml_file(tmpdir):
     }
 
 
+GLOB_TOML_FIXTURE = """
+[bumpver]
+current_version = "v2020.1003-alpha"
+version_pattern = "vYYYY.BUILD[-TAG]"
+
+[bumpver.file_patterns]
+"pkg/*.py" = ['__version__ = "{version}"']
+"""
+
+
+def test_parse_glob_picks_up_new_files(tmpdir, monkeypatch):
+    project_path = tmpdir.mkdir("globbed")
+    project_path.join("bumpver.toml").write(GLOB_TOML_FIXTURE)
+    project_path.mkdir("pkg").join("a.py").write('__version__ = "v2020.1003-alpha"\n')
+    monkeypatch.chdir(project_path)
+
+    _, cfg = config.init(".")
+    assert cfg
+    assert sorted(cfg.file_patterns) == ["bumpver.toml", os.path.join("pkg", "a.py")]
+
+    project_path.join("pkg", "b.py").write('__version__ = "v2020.1003-alpha"\n')
+
+    _, cfg = config.init(".")
+    assert cfg
+    assert sorted(cfg.file_patterns) == [
+        "bumpver.toml",
+        os.path.join("pkg", "a.py"),
+        os.path.join("pkg", "b.py"),
+    ]
+
+
 def test_parse_default_pattern():
     project_path    = util.FIXTURES_DIR / "project_c"
     config_path     = util.FIXTURES_DIR / "project_c" / "pyproject.toml"
@@ -4,8 +4,11 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import unicode_literals
 
+import io
+
 from bumpver import parse
 from bumpver import v1patterns
+from bumpver import v2patterns
 
 SETUP_PY_FIXTURE = """
 # setup.py
@@ -34,6 +37,13 @@ def test_default_parse_patterns():
     assert matches[1].match == "201712.2a0"
 
 
+def test_parse_no_lines():
+    # all parts of the pattern are optional, so it matches the empty string
+    pattern = v2patterns.compile_pattern("MAJOR.MINOR[.PATCH]", "[MAJOR.MINOR.PATCH]")
+    assert list(parse.iter_matches([], [pattern])) == []
+    assert list(parse.iter_matches([""], [pattern])) == []
+
+
 def test_explicit_parse_patterns():
     lines = SETUP_PY_FIXTURE.splitlines()
 
@@ -52,6 +62,20 @@ def test_explicit_parse_patterns():
     assert matches[1].match == "version='201712.2a0'"
 
 
+def test_parse_patterns_from_fobj():
+    patterns    = ["{pycalver}", "{pep440_pycalver}"]
+    re_patterns = [v1patterns.compile_pattern(p) for p in patterns]
+    fobj        = io.StringIO(SETUP_PY_FIXTURE)
+    matches     = list(parse.iter_matches(fobj, re_patterns))
+    assert len(matches) == 2
+
+    assert matches[0].lineno == 3
+    assert matches[1].lineno == 6
+
+    assert matches[0].match == "v201712.0002-alpha"
+    assert matches[1].match == "201712.2a0"
+
+
 README_RST_FIXTURE = """
 :alt: PyPI version
 
@@ -174,6 +174,14 @@ def test_v2_part_compilation(part_name):
     assert _compile_part_re(v1patterns.PART_PATTERNS[part_name])
 
 
+@pytest.mark.parametrize("part_name", v1patterns.PART_PATTERNS.keys())
+def test_v1_single_part_pattern_strs(part_name):
+    placeholder     = "{" + part_name + "}"
+    escaped_pattern = placeholder.translate(v1patterns.RE_PATTERN_ESCAPE_TABLE)
+    expected        = v1patterns._replace_pattern_parts(escaped_pattern)
+    assert v1patterns.SINGLE_PART_PATTERN_STRS[placeholder] == expected
+
+
 PATTERN_PART_CASES = [
     ("pep440_pycalver", "201712.31"          , "201712.31"),
     ("pep440_pycalver", "v201712.0032"       , None),
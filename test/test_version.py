@@ -9,6 +9,7 @@ import datetime as dt
 
 import pytest
 
+from bumpver import utils
 from bumpver import version
 from bumpver import v1version
 from bumpver import v2version
@@ -106,6 +107,34 @@ def test_parse_version_info():
     assert version_info.tag   == "final"
 
 
+@pytest.mark.parametrize(
+    "version_str",
+    [
+        "v201712.0001-alpha",
+        "v201712.0001",
+        "v201700.0001-final",
+        "v201709.10001-post",
+        "v201712.0001-betax",
+        "v201712.0001-",
+        "v201713.0001",
+        "v201712.001",
+        "v201712.0001x",
+        "v2017.12.0001",
+    ],
+)
+def test_parse_pycalver_fast_path(version_str):
+    pattern     = v1patterns.compile_pattern("{pycalver}")
+    match       = pattern.regexp.match(version_str)
+    is_complete = bool(match) and match.group() == version_str
+
+    field_values = v1version._parse_pycalver_field_values(version_str)
+    assert (field_values is not None) == is_complete
+
+    if match:
+        expected_vinfo = v1version._parse_version_info(match.groupdict())
+        assert v1version.parse_version_info(version_str) == expected_vinfo
+
+
 def test_readme_pycalver1():
     version_str  = "v201712.0001-alpha"
     version_info = v1patterns.PYCALVER_RE.match(version_str).groupdict()
@@ -138,6 +167,12 @@ def test_readme_pycalver2():
     }
 
 
+def test_pycalver_re_terminator():
+    assert v1patterns.PYCALVER_RE.match("v201712.0033 ").group(0) == "v201712.0033"
+    assert v1patterns.PYCALVER_RE.match("v201712.0033-beta\n").group(0) == "v201712.0033-beta"
+    assert v1patterns.PYCALVER_RE.match("v201712.0033-betax") is None
+
+
 def test_parse_error_empty():
     try:
         v1version.parse_version_info("")
@@ -162,6 +197,15 @@ def test_parse_error_nopadding():
         assert "Invalid version string" in str(err)
 
 
+def test_parse_version_info_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(v2version, '_PARSE_VERSION_INFO_CACHE', utils.BoundedCache(maxsize=2))
+
+    for patch in range(5):
+        vinfo = v2version.parse_version_info(f"1.2.{patch}", raw_pattern="MAJOR.MINOR.PATCH")
+        assert vinfo.patch == patch
+        assert len(v2version._PARSE_VERSION_INFO_CACHE) <= 2
+
+
 def test_part_field_mapping_v1():
     a_names = set(v1patterns.PATTERN_PART_FIELDS.keys())
     b_names = set(v1patterns.PART_PATTERNS.keys())